@@ -8,17 +8,64 @@ Provides safe, auditable, and user-controlled privilege management.
 
 import os
 import sys
+import atexit
 import subprocess
-import tempfile
+import threading
+import time
+import weakref
 import json
+import shlex
 import logging
+import logging.handlers
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Any
 from enum import Enum
+from functools import cached_property, lru_cache
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
-class PermissionLevel(Enum):
+if sys.platform == 'win32':
+    import ctypes
+
+# orjson is optional; it serializes dataclasses and datetimes natively
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Commands that typically require elevated permissions
+_ELEVATED_CMDS = frozenset({
+    'sudo', 'doas', 'su', 'apt', 'apt-get', 'yum', 'dnf', 'pacman',
+    'systemctl', 'service', 'mount', 'umount', 'fdisk', 'mkfs',
+    'useradd', 'usermod', 'userdel', 'chmod', 'chown', 'visudo',
+    'pip', 'conda', 'npm', 'yarn'  # Package managers
+})
+
+# Administrative commands
+_ADMIN_CMDS = frozenset({
+    'crontab', 'iptables', 'ufw', 'firewall-cmd', 'sysctl',
+    'hostnamectl', 'timedatectl', 'localectl'
+})
+
+# Seconds between background flushes of the audit log
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Bytes of audit entries buffered before a flush is forced
+_AUDIT_BUFFER_SIZE = 65536
+
+# Maximum number of operations kept in a manager's session history
+DEFAULT_SESSION_CAP = 1000
+
+# Lines of command output kept for the result message
+_OUTPUT_TAIL_LINES = 200
+
+# Privileged path prefixes. A tuple lets str.startswith test them all in
+# one C-level call; switch to a prefix trie if this list ever grows to
+# hundreds of entries.
+_PRIV_PATHS = ('/etc', '/usr/local', '/opt', '/var', '/root')
+
+class PermissionLevel(str, Enum):
     """Permission levels for operations"""
     BASIC = "basic"          # User-level operations only
     ELEVATED = "elevated"    # Requires sudo/admin privileges
@@ -42,6 +89,7 @@ class PrivilegedOperation:
     timeout: int = 300
     working_directory: Optional[str] = None
     environment: Optional[Dict[str, str]] = None
+    stdin_data: Optional[str] = None
 
 @dataclass
 class AuditEntry:
@@ -53,6 +101,80 @@ class AuditEntry:
     user: str
     details: Dict[str, Any]
 
+def _serialize_audit_entry(entry: AuditEntry) -> bytes:
+    """Serialize an audit entry as a single newline-terminated JSON line"""
+    if orjson is not None:
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+
+    log_entry = asdict(entry)
+    log_entry['timestamp'] = entry.timestamp.isoformat()
+    return (json.dumps(log_entry, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8')
+
+@lru_cache(maxsize=512)
+def _analyze_command(command: Tuple[str, ...]) -> PermissionLevel:
+    """
+    Classify a command by the permission level it requires.
+
+    The classification depends only on the command itself, so results are
+    cached process-wide and shared by every PermissionManager.
+    """
+    if not command:
+        return PermissionLevel.BASIC
+
+    first_cmd = command[0].lower()
+
+    if first_cmd in _ADMIN_CMDS:
+        return PermissionLevel.ADMINISTRATIVE
+    elif first_cmd in _ELEVATED_CMDS:
+        return PermissionLevel.ELEVATED
+
+    # Check for privileged file paths
+    if any(arg.startswith(_PRIV_PATHS) for arg in command):
+        return PermissionLevel.ELEVATED
+
+    return PermissionLevel.BASIC
+
+# Managers with an open audit log. Held weakly so a manager that is never
+# closed can still be collected; one shared thread flushes them all.
+_open_managers: "weakref.WeakSet[PermissionManager]" = weakref.WeakSet()
+_flusher_lock = threading.Lock()
+_flusher_thread: Optional[threading.Thread] = None
+
+def _flush_open_managers_once():
+    """Flush every open audit log"""
+    for manager in list(_open_managers):
+        try:
+            manager._flush_audit_log()
+        except OSError as e:
+            manager.logger.error(f"Failed to flush audit log: {e}")
+
+def _flush_open_managers():
+    """Flush every open audit log every DEFAULT_FLUSH_INTERVAL seconds"""
+    while True:
+        time.sleep(DEFAULT_FLUSH_INTERVAL)
+        # Flush from a separate frame so no manager reference outlives the
+        # pass and keeps a dropped manager alive while we sleep
+        _flush_open_managers_once()
+
+def _register_manager(manager: "PermissionManager"):
+    """Track an open manager, starting the shared flusher on first use"""
+    global _flusher_thread
+    with _flusher_lock:
+        _open_managers.add(manager)
+        if _flusher_thread is None:
+            _flusher_thread = threading.Thread(
+                target=_flush_open_managers,
+                name="audit-log-flush",
+                daemon=True
+            )
+            _flusher_thread.start()
+
+@atexit.register
+def _close_open_managers():
+    """Flush and close any audit logs still open at interpreter exit"""
+    for manager in list(_open_managers):
+        manager.close()
+
 class PermissionManager:
     """Manages permissions and privilege escalation for Python SDK"""
 
@@ -64,38 +186,115 @@ class PermissionManager:
             log_file: Path to audit log file
         """
         self.log_file = log_file or Path.home() / ".claude-python" / "audit.log"
+
+        # Keep the audit log open for the manager's lifetime; entries are
+        # buffered and flushed periodically, on close() or at interpreter exit.
+        # Each flush is a single O_APPEND write of whole lines, so managers in
+        # other processes sharing the file never interleave partial entries.
+        # Open it before anything else touches the directory so a new audit
+        # log is always created owner-only.
+        Path(self.log_file).parent.mkdir(parents=True, exist_ok=True)
+        self._audit_fd: Optional[int] = os.open(
+            str(self.log_file), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600
+        )
         self.setup_logging()
+        self._audit_buffer = bytearray()
+        self._audit_lock = threading.Lock()
+        _register_manager(self)
         self.current_user = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
 
-        # Check if running in privileged environment
-        self.is_privileged = self._check_privileged_status()
+        # Operation history for session, capped so long-running processes
+        # don't grow without bound (override with CLAUDE_AUDIT_SESSION_CAP)
+        self.session_operations: Deque[AuditEntry] = deque(maxlen=self._session_cap())
+
+    def _session_cap(self) -> int:
+        """Read the session history cap, falling back to the default if invalid"""
+        value = os.getenv('CLAUDE_AUDIT_SESSION_CAP')
+        if not value:
+            return DEFAULT_SESSION_CAP
+        try:
+            cap = int(value)
+        except ValueError:
+            cap = -1
+        if cap < 0:
+            self.logger.warning(
+                f"Invalid CLAUDE_AUDIT_SESSION_CAP {value!r}, using {DEFAULT_SESSION_CAP}"
+            )
+            return DEFAULT_SESSION_CAP
+        return cap
+
+    def close(self):
+        """Flush and close the audit log"""
+        _open_managers.discard(self)
+        self._flush_audit_log()
+        with self._audit_lock:
+            if self._audit_fd is not None:
+                os.close(self._audit_fd)
+                self._audit_fd = None
+
+    def __del__(self):
+        # Don't lose buffered entries or leak the fd if close() was never called
+        if getattr(self, '_audit_lock', None) is not None:
+            try:
+                self.close()
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
 
-        # Operation history for session
-        self.session_operations: List[AuditEntry] = []
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _flush_audit_log(self, sync: bool = False):
+        """Flush buffered audit entries, optionally forcing them to disk"""
+        with self._audit_lock:
+            if self._audit_fd is None:
+                return
+            while self._audit_buffer:
+                written = os.write(self._audit_fd, self._audit_buffer)
+                del self._audit_buffer[:written]
+            if sync:
+                os.fsync(self._audit_fd)
 
     def setup_logging(self):
         """Set up logging for audit trail"""
         log_dir = Path(self.log_file).parent
         log_dir.mkdir(parents=True, exist_ok=True)
 
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
         self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+
+        if not self.logger.handlers:
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+            # Text records go to their own file next to the audit log so
+            # the audit log itself stays JSON lines only. Buffer them and
+            # only hit the disk in batches, on warnings, or at shutdown.
+            file_handler = logging.FileHandler(log_dir / "permission-manager.log")
+            file_handler.setFormatter(formatter)
+            memory_handler = logging.handlers.MemoryHandler(
+                capacity=128,
+                flushLevel=logging.WARNING,
+                target=file_handler
+            )
+            atexit.register(memory_handler.flush)
 
-    def _check_privileged_status(self) -> bool:
-        """Check if running with elevated privileges"""
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(formatter)
+
+            self.logger.addHandler(memory_handler)
+            self.logger.addHandler(stream_handler)
+
+    @cached_property
+    def is_privileged(self) -> bool:
+        """Whether the process is running with elevated privileges"""
         try:
-            # On Unix-like systems, check if running as root
-            if hasattr(os, 'getuid'):
-                return os.getuid() == 0
+            # On Unix-like systems, check if the effective user is root
+            if hasattr(os, 'geteuid'):
+                return os.geteuid() == 0
             # On Windows, check if running as administrator
-            import ctypes
             return ctypes.windll.shell32.IsUserAnAdmin() != 0
         except Exception:
             return False
@@ -110,7 +309,7 @@ class PermissionManager:
         Returns:
             True if elevation is required
         """
-        if operation.permission_level == PermissionLevel.BASIC:
+        if operation.permission_level is PermissionLevel.BASIC:
             return False
 
         if self.is_privileged:
@@ -128,36 +327,7 @@ class PermissionManager:
         Returns:
             Required permission level
         """
-        if not command:
-            return PermissionLevel.BASIC
-
-        # Commands that typically require elevated permissions
-        elevated_commands = {
-            'sudo', 'doas', 'su', 'apt', 'apt-get', 'yum', 'dnf', 'pacman',
-            'systemctl', 'service', 'mount', 'umount', 'fdisk', 'mkfs',
-            'useradd', 'usermod', 'userdel', 'chmod', 'chown', 'visudo',
-            'pip', 'conda', 'npm', 'yarn'  # Package managers
-        }
-
-        # Administrative commands
-        admin_commands = {
-            'crontab', 'iptables', 'ufw', 'firewall-cmd', 'sysctl',
-            'hostnamectl', 'timedatectl', 'localectl'
-        }
-
-        first_cmd = command[0].lower()
-
-        if first_cmd in admin_commands:
-            return PermissionLevel.ADMINISTRATIVE
-        elif first_cmd in elevated_commands:
-            return PermissionLevel.ELEVATED
-
-        # Check for privileged file paths
-        privileged_paths = ['/etc', '/usr/local', '/opt', '/var', '/root']
-        if any(arg.startswith(path) for arg in command for path in privileged_paths):
-            return PermissionLevel.ELEVATED
-
-        return PermissionLevel.BASIC
+        return _analyze_command(tuple(command))
 
     def request_permission(self, operation: PrivilegedOperation) -> bool:
         """
@@ -177,9 +347,9 @@ class PermissionManager:
         print(f"Command: {' '.join(operation.command)}")
         print(f"Permission Level: {operation.permission_level.value}")
 
-        if operation.permission_level == PermissionLevel.ADMINISTRATIVE:
+        if operation.permission_level is PermissionLevel.ADMINISTRATIVE:
             print("⚠️  This operation makes system-level changes")
-        elif operation.permission_level == PermissionLevel.ELEVATED:
+        elif operation.permission_level is PermissionLevel.ELEVATED:
             print("⚠️  This operation requires elevated privileges")
 
         while True:
@@ -223,30 +393,75 @@ class PermissionManager:
             # Prefix with sudo for elevation
             command = ['sudo'] + command
 
-        # Set up environment
-        env = os.environ.copy()
-        if operation.environment:
-            env.update(operation.environment)
+        # Set up environment; without overrides the child inherits ours
+        env = {**os.environ, **operation.environment} if operation.environment else None
 
         try:
-            # Execute the command
+            # Execute the command, merging stderr into stdout so output can
+            # be streamed as it arrives
             process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.PIPE if operation.stdin_data is not None else None,
                 text=True,
+                # Tool output isn't always valid text; keep reading past bad bytes
+                errors='replace',
+                bufsize=1,
                 cwd=operation.working_directory,
                 env=env
             )
 
-            stdout, stderr = process.communicate(timeout=operation.timeout)
-
-            if process.returncode == 0:
+            # Feed stdin from a separate thread so large input can't block
+            # against unread output
+            if operation.stdin_data is not None:
+                def feed_stdin():
+                    try:
+                        process.stdin.write(operation.stdin_data)
+                        process.stdin.close()
+                    except OSError:
+                        pass
+
+                threading.Thread(target=feed_stdin, daemon=True).start()
+
+            # Drain output on a reader thread so a grandchild holding the
+            # pipe open can't stall us past the timeout. The reader owns the
+            # pipe and closes it once it sees EOF.
+            output_tail: Deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
+            read_errors: List[OSError] = []
+
+            def drain_output():
+                try:
+                    for line in process.stdout:
+                        self.logger.info(line.rstrip('\n'))
+                        output_tail.append(line)
+                except OSError as e:
+                    read_errors.append(e)
+                finally:
+                    process.stdout.close()
+
+            reader = threading.Thread(target=drain_output, daemon=True)
+            reader.start()
+
+            # Bound both the process and the remaining output by the timeout;
+            # on expiry the handler below kills the process and we return
+            # without waiting for the reader
+            deadline = time.monotonic() + operation.timeout
+            process.wait(timeout=operation.timeout)
+            reader.join(max(0.0, deadline - time.monotonic()))
+            if reader.is_alive():
+                raise subprocess.TimeoutExpired(command, operation.timeout)
+
+            output = ''.join(output_tail)
+            if read_errors:
+                result = OperationResult.OPERATION_FAILED
+                message = f"Failed to read command output: {read_errors[0]}"
+            elif process.returncode == 0:
                 result = OperationResult.SUCCESS
-                message = stdout or "Operation completed successfully"
+                message = output or "Operation completed successfully"
             else:
                 result = OperationResult.OPERATION_FAILED
-                message = f"Command failed with return code {process.returncode}: {stderr}"
+                message = f"Command failed with return code {process.returncode}: {output}"
 
         except subprocess.TimeoutExpired:
             result = OperationResult.OPERATION_FAILED
@@ -290,18 +505,20 @@ class PermissionManager:
         self.session_operations.append(audit_entry)
 
         # Write to log file
-        log_entry = {
-            'timestamp': audit_entry.timestamp.isoformat(),
-            'operation': audit_entry.operation,
-            'permission_level': audit_entry.permission_level,
-            'result': audit_entry.result,
-            'user': audit_entry.user,
-            'details': audit_entry.details
-        }
-
         try:
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
+            with self._audit_lock:
+                if self._audit_fd is None:
+                    raise ValueError("audit log is closed")
+                self._audit_buffer += _serialize_audit_entry(audit_entry)
+                buffer_full = len(self._audit_buffer) >= _AUDIT_BUFFER_SIZE
+
+            # Administrative and failed operations are made durable right
+            # away; routine entries ride the periodic flush
+            if (operation.permission_level is PermissionLevel.ADMINISTRATIVE or
+                    result != OperationResult.SUCCESS):
+                self._flush_audit_log(sync=True)
+            elif buffer_full:
+                self._flush_audit_log()
         except Exception as e:
             self.logger.error(f"Failed to write audit log: {e}")
 
@@ -347,28 +564,29 @@ class PermissionManager:
         Returns:
             Tuple of (result, message)
         """
-        commands = []
-
-        # Change permissions
-        if permissions:
-            commands.append(["chmod", permissions, file_path])
-
-        # Change ownership if specified
-        if owner:
-            commands.append(["chown", owner, file_path])
-
-        results = []
-        for cmd in commands:
-            operation = PrivilegedOperation(
-                command=cmd,
-                description=f"Change permissions/ownership for {file_path}",
-                permission_level=PermissionLevel.ELEVATED
-            )
-            result, message = self.execute_with_escalation(operation)
-            results.append((result, message))
+        if permissions and owner:
+            # Run both changes through a single escalation
+            command = [
+                "sh", "-c",
+                f"chmod {shlex.quote(permissions)} {shlex.quote(file_path)} && "
+                f"chown {shlex.quote(owner)} {shlex.quote(file_path)}"
+            ]
+        elif permissions:
+            command = ["chmod", permissions, file_path]
+        elif owner:
+            command = ["chown", owner, file_path]
+        else:
+            return OperationResult.SUCCESS, "Permissions updated successfully"
 
-            if result != OperationResult.SUCCESS:
-                return result, message
+        operation = PrivilegedOperation(
+            command=command,
+            description=f"Change permissions/ownership for {file_path}",
+            permission_level=PermissionLevel.ELEVATED
+        )
+        result, message = self.execute_with_escalation(operation)
+
+        if result != OperationResult.SUCCESS:
+            return result, message
 
         return OperationResult.SUCCESS, "Permissions updated successfully"
 
@@ -403,8 +621,32 @@ class PermissionManager:
         return self.execute_with_escalation(operation)
 
     def get_session_history(self) -> List[AuditEntry]:
-        """Get the history of operations in the current session"""
-        return self.session_operations.copy()
+        """Get the most recent operations in the current session"""
+        return list(self.session_operations)
+
+    def _read_audit_tail(self, limit: int) -> Deque[Dict[str, Any]]:
+        """Read the last ``limit`` JSON entries without loading the whole log"""
+        with open(self.log_file, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            window = max(limit, 1) * 512
+
+            while True:
+                start = max(0, size - window)
+                f.seek(start)
+                if start:
+                    f.readline()  # Discard the partial first line
+
+                entries: Deque[Dict[str, Any]] = deque(maxlen=limit)
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+
+                # Widen the window if long entries left us short
+                if len(entries) >= limit or start == 0:
+                    return entries
+                window *= 4
 
     def get_audit_summary(self, limit: int = 50) -> Dict[str, Any]:
         """
@@ -417,25 +659,25 @@ class PermissionManager:
             Summary dictionary with statistics
         """
         try:
-            entries = []
-            with open(self.log_file, 'r') as f:
-                for line in f:
-                    try:
-                        entries.append(json.loads(line.strip()))
-                    except json.JSONDecodeError:
-                        continue
+            # Make buffered entries from this session visible to the reader
+            self._flush_audit_log()
+
+            recent_entries = self._read_audit_tail(limit)
 
-            # Take the most recent entries
-            recent_entries = entries[-limit:] if len(entries) > limit else entries
+            # Calculate statistics in a single pass
+            success_count = elevated_count = 0
+            for entry in recent_entries:
+                if entry['result'] == 'success':
+                    success_count += 1
+                if entry['permission_level'] in ('elevated', 'administrative'):
+                    elevated_count += 1
 
-            # Calculate statistics
             summary = {
                 'total_entries': len(recent_entries),
-                'success_count': sum(1 for e in recent_entries if e['result'] == 'success'),
-                'failure_count': sum(1 for e in recent_entries if e['result'] != 'success'),
-                'elevated_operations': sum(1 for e in recent_entries
-                                         if e['permission_level'] in ['elevated', 'administrative']),
-                'recent_operations': recent_entries[-10:]  # Last 10 operations
+                'success_count': success_count,
+                'failure_count': len(recent_entries) - success_count,
+                'elevated_operations': elevated_count,
+                'recent_operations': list(recent_entries)[-10:]  # Last 10 operations
             }
 
             return summary
@@ -493,34 +735,26 @@ RestartSec=10
 WantedBy=multi-user.target
 """
 
-        # Write service file
+        # Pipe the service file straight to its system location
         service_file = f"/etc/systemd/system/{service_name}.service"
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-            f.write(service_content)
-            temp_file = f.name
-
-        # Move service file to system location
         operation = PrivilegedOperation(
-            command=["cp", temp_file, service_file],
+            command=["sh", "-c", f"tee {shlex.quote(service_file)} > /dev/null"],
             description=f"Create systemd service: {service_name}",
-            permission_level=PermissionLevel.ADMINISTRATIVE
+            permission_level=PermissionLevel.ADMINISTRATIVE,
+            stdin_data=service_content
         )
 
         result, message = self.manager.execute_with_escalation(operation)
 
-        # Clean up temp file
-        os.unlink(temp_file)
-
         if result == OperationResult.SUCCESS:
-            # Reload systemd and enable service
-            for cmd in [["systemctl", "daemon-reload"],
-                       ["systemctl", "enable", service_name]]:
-                op = PrivilegedOperation(
-                    command=cmd,
-                    description=f"Setup service {service_name}",
-                    permission_level=PermissionLevel.ADMINISTRATIVE
-                )
-                self.manager.execute_with_escalation(op)
+            # Reload systemd and enable service in one escalation
+            op = PrivilegedOperation(
+                command=["sh", "-c",
+                         f"systemctl daemon-reload && systemctl enable {shlex.quote(service_name)}"],
+                description=f"Setup service {service_name}",
+                permission_level=PermissionLevel.ADMINISTRATIVE
+            )
+            self.manager.execute_with_escalation(op)
 
         print(f"Service creation: {message}")
         return result == OperationResult.SUCCESS
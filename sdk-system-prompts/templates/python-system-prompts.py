@@ -7,11 +7,22 @@ system prompts based on context and user requirements.
 """
 
 import os
+import re
 import json
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass
 
+# Matches {{variable}} placeholders in prompt content
+_VAR_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# Category subdirectories that prompts are loaded from, in load order; a
+# later category overrides an earlier prompt with the same name
+_CATEGORY_ORDER = {
+    category: rank
+    for rank, category in enumerate(["shared", "claude-code-cli", "python-sdk", "typescript-sdk"])
+}
+
 @dataclass
 class SystemPrompt:
     """Represents a system prompt with metadata"""
@@ -37,40 +48,65 @@ class SystemPromptManager:
             prompts_dir = Path(__file__).parent.parent / "sdk-system-prompts"
 
         self.prompts_dir = Path(prompts_dir)
+        # Prompt files are indexed up front but only parsed when requested
+        self._index: Dict[str, Tuple[Path, str]] = {}
         self._prompts: Dict[str, SystemPrompt] = {}
-        self._load_prompts()
-
-    def _load_prompts(self):
-        """Load all system prompts from markdown files"""
+        # Lower-cased name, description and tags of each parsed prompt, for
+        # search_prompts. NUL separators keep a query from matching across
+        # field boundaries.
+        self._search_blobs: Dict[str, str] = {}
+        self._index_prompts()
+
+    def _index_prompts(self):
+        """Index system prompt markdown files without reading them"""
         if not self.prompts_dir.exists():
             raise FileNotFoundError(f"Prompts directory not found: {self.prompts_dir}")
 
-        # Load prompts from different categories
-        categories = ["shared", "claude-code-cli", "python-sdk", "typescript-sdk"]
-
-        for category in categories:
-            category_dir = self.prompts_dir / category
-            if category_dir.exists():
-                self._load_category_prompts(category_dir, category)
-
-    def _load_category_prompts(self, category_dir: Path, category: str):
-        """Load prompts from a specific category directory"""
-        for prompt_file in category_dir.glob("*.md"):
-            prompt = self._parse_prompt_file(prompt_file, category)
+        # Index prompts from the known category directories in one traversal,
+        # sorted so the order and duplicate-name winner don't depend on the
+        # filesystem
+        prompt_files = sorted(
+            (f for f in self.prompts_dir.glob("*/*.md") if f.parent.name in _CATEGORY_ORDER),
+            key=lambda f: (_CATEGORY_ORDER[f.parent.name], f.name)
+        )
+        for prompt_file in prompt_files:
+            self._index[prompt_file.stem] = (prompt_file, prompt_file.parent.name)
+
+    def _load_prompt(self, name: str) -> Optional[SystemPrompt]:
+        """Parse an indexed prompt on first use and cache it"""
+        prompt = self._prompts.get(name)
+        if prompt is None and name in self._index:
+            prompt = self._parse_prompt_file(*self._index[name])
             if prompt:
-                self._prompts[prompt.name] = prompt
+                self._prompts[name] = prompt
+                self._search_blobs[name] = '\0'.join(
+                    [prompt.name, prompt.description, *prompt.tags]
+                ).lower()
+            else:
+                # Drop unparseable files so errors are only reported once
+                del self._index[name]
+        return prompt
+
+    def _load_prompts(self, category: Optional[str] = None) -> List[SystemPrompt]:
+        """Parse and return all indexed prompts, optionally for one category"""
+        prompts = []
+        for name, (_, prompt_category) in list(self._index.items()):
+            if category and prompt_category != category:
+                continue
+            prompt = self._load_prompt(name)
+            if prompt:
+                prompts.append(prompt)
+        return prompts
 
     def _parse_prompt_file(self, file_path: Path, category: str) -> Optional[SystemPrompt]:
         """Parse a markdown file into a SystemPrompt object"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = file_path.read_text(encoding='utf-8')
 
             # Extract metadata from frontmatter or comments
             name = file_path.stem
-            description = self._extract_description(content)
+            description, tags = self._parse_metadata(content)
             variables = self._extract_variables(content)
-            tags = self._extract_tags(content)
 
             return SystemPrompt(
                 name=name,
@@ -84,30 +120,26 @@ class SystemPromptManager:
             print(f"Error parsing prompt file {file_path}: {e}")
             return None
 
-    def _extract_description(self, content: str) -> str:
-        """Extract description from markdown content"""
-        lines = content.split('\n')
-        for line in lines:
-            if line.strip().startswith('# '):
-                return line.strip().lstrip('# ').strip()
-        return "No description available"
+    def _parse_metadata(self, content: str) -> Tuple[str, List[str]]:
+        """Extract description and tags from markdown content in one pass"""
+        description = None
+        tags = None
+        for line in content.splitlines():
+            stripped = line.strip()
+            if description is None and stripped.startswith('# '):
+                description = stripped.lstrip('# ').strip()
+            elif tags is None and stripped.startswith('Tags:'):
+                tags = [tag.strip() for tag in line.replace('Tags:', '').split(',')]
+            if description is not None and tags is not None:
+                break
+
+        if description is None:
+            description = "No description available"
+        return description, tags if tags is not None else []
 
     def _extract_variables(self, content: str) -> List[str]:
         """Extract variable placeholders from content"""
-        import re
-        # Find {{variable}} patterns
-        variables = re.findall(r'\{\{(\w+)\}\}', content)
-        return list(set(variables))
-
-    def _extract_tags(self, content: str) -> List[str]:
-        """Extract tags from content"""
-        tags = []
-        lines = content.split('\n')
-        for line in lines:
-            if line.strip().startswith('Tags:'):
-                tags = [tag.strip() for tag in line.replace('Tags:', '').split(',')]
-                break
-        return tags
+        return list(set(_VAR_RE.findall(content)))
 
     def get_prompt(self, name: str, variables: Optional[Dict[str, str]] = None) -> str:
         """
@@ -120,16 +152,18 @@ class SystemPromptManager:
         Returns:
             The prompt content with variables substituted
         """
-        if name not in self._prompts:
+        prompt = self._load_prompt(name)
+        if prompt is None:
             raise ValueError(f"Prompt '{name}' not found")
 
-        prompt = self._prompts[name]
         content = prompt.content
 
-        # Substitute variables if provided
+        # Substitute variables in a single pass, leaving unknown placeholders as-is
         if variables:
-            for var_name, var_value in variables.items():
-                content = content.replace(f"{{{{{var_name}}}}}", var_value)
+            content = _VAR_RE.sub(
+                lambda match: variables.get(match.group(1), match.group(0)),
+                content
+            )
 
         return content
 
@@ -143,10 +177,7 @@ class SystemPromptManager:
         Returns:
             List of SystemPrompt objects
         """
-        prompts = list(self._prompts.values())
-
-        if category:
-            prompts = [p for p in prompts if p.category == category]
+        prompts = self._load_prompts(category)
 
         return sorted(prompts, key=lambda p: (p.category, p.name))
 
@@ -161,22 +192,11 @@ class SystemPromptManager:
             List of matching SystemPrompt objects
         """
         query_lower = query.lower()
-        matches = []
-
-        for prompt in self._prompts.values():
-            if (query_lower in prompt.name.lower() or
-                query_lower in prompt.description.lower() or
-                any(query_lower in tag.lower() for tag in prompt.tags)):
-                matches.append(prompt)
-
-        return matches
+        return [p for p in self._load_prompts() if query_lower in self._search_blobs[p.name]]
 
     def get_prompt_by_category(self, category: str) -> Dict[str, SystemPrompt]:
         """Get all prompts from a specific category"""
-        return {
-            name: prompt for name, prompt in self._prompts.items()
-            if prompt.category == category
-        }
+        return {prompt.name: prompt for prompt in self._load_prompts(category)}
 
 # Predefined prompt constants for easy access
 class PythonPrompts:
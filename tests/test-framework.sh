@@ -207,6 +207,44 @@ test_uninstaller() {
     end_test "passed"
 }
 
+test_permission_manager_collection() {
+    start_test "Permission Manager Cleanup" "Testing that dropped managers are collected"
+
+    local manager_script="$SCRIPT_DIR/../permission-management/python-sdk/permission-manager.py"
+    local audit_log="$TEST_DIR/permission-manager/audit.log"
+
+    # Drop managers without closing them and let the shared flusher run;
+    # every one should be collected and its audit log closed
+    local alive
+    if ! alive=$(python3 - "$manager_script" "$audit_log" <<'PYEOF'
+import gc, importlib.util, sys, time, weakref
+spec = importlib.util.spec_from_file_location("permission_manager", sys.argv[1])
+pm = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(pm)
+managers = [pm.PermissionManager(sys.argv[2]) for _ in range(5)]
+refs = [weakref.ref(m) for m in managers]
+time.sleep(pm.DEFAULT_FLUSH_INTERVAL * 1.5)
+del managers
+gc.collect()
+time.sleep(pm.DEFAULT_FLUSH_INTERVAL * 2)
+gc.collect()
+print(sum(ref() is not None for ref in refs))
+PYEOF
+    ); then
+        end_test "failed" "Permission manager script failed to run"
+        return 1
+    fi
+
+    if [[ "$alive" == "0" ]]; then
+        echo "✓ Dropped permission managers are collected"
+    else
+        end_test "failed" "$alive dropped permission managers still alive"
+        return 1
+    fi
+
+    end_test "passed"
+}
+
 assert_directory_exists() {
     local dir_path="$1"
     local message="${2:-Directory should exist: $dir_path}"
@@ -243,6 +281,7 @@ run_all_tests() {
     test_configuration_management
     test_installation_detection
     test_uninstaller
+    test_permission_manager_collection
 
     # Display summary
     echo ""
@@ -273,6 +312,7 @@ export -f start_test end_test assert_equals assert_file_exists assert_directory_
 export -f create_mock_binary create_mock_config
 export -f test_core_utilities test_configuration_management
 export -f test_installation_detection test_uninstaller
+export -f test_permission_manager_collection
 export -f run_all_tests cleanup_test_environment
 
 # Main execution
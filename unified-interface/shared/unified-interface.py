@@ -7,38 +7,80 @@ preserving their unique capabilities.
 """
 
 import os
+import sys
 import json
+import shutil
 import asyncio
 import logging
+import importlib.util
+import tempfile
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, AsyncIterable
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Tuple, Union, AsyncIterable
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property, lru_cache
 
-# Import SDK-specific adapters
+if TYPE_CHECKING:
+    import argparse
+
+# Use orjson for config and template JSON when available
 try:
-    from .python_adapter import PythonAdapter
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
 except ImportError:
-    PythonAdapter = None
+    _loads = json.loads
 
-try:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+# SDK-specific adapters are imported only when first constructed, so
+# CLI-only flows never pay for importing the Python SDK
+def _adapter_available(module: str) -> bool:
+    """Check whether an adapter module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(module, __package__) is not None
+    except (ImportError, ValueError):
+        return False
+
+def _load_python_adapter() -> type:
+    from .python_adapter import PythonAdapter
+    return PythonAdapter
+
+def _load_cli_adapter() -> type:
     from .cli_adapter import CliAdapter
-except ImportError:
-    CliAdapter = None
+    return CliAdapter
 
 class SDKType(Enum):
     CLAUDE_CODE_CLI = "claude-code-cli"
     PYTHON_SDK = "python-sdk"
     TYPESCRIPT_SDK = "typescript-sdk"
 
-@dataclass
+# Direct value lookup, avoiding SDKType(value) on hot paths
+_SDK_BY_VALUE: Dict[str, SDKType] = {sdk.value: sdk for sdk in SDKType}
+
+def _sdk_from_value(value: str) -> SDKType:
+    """Get the SDKType for its string value"""
+    try:
+        return _SDK_BY_VALUE[value]
+    except KeyError:
+        raise ValueError(f"Unknown SDK: {value}") from None
+
+# Slotted dataclasses (Python 3.10+) skip the per-instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class ChatMessage:
     role: str
     content: str
     timestamp: Optional[str] = None
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AnalysisResult:
     file_path: str
     analysis: str
@@ -46,7 +88,7 @@ class AnalysisResult:
     issues: List[str]
     confidence: float
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ProjectTemplate:
     name: str
     type: str
@@ -55,6 +97,57 @@ class ProjectTemplate:
     files: Dict[str, str]
     dependencies: List[str]
 
+_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# Parsed config and template files keyed by path, as (st_mtime_ns, value)
+_CONFIG_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+_TEMPLATE_CACHE: Dict[str, Tuple[int, ProjectTemplate]] = {}
+
+def _deep_merge(dst: Dict[str, Any], src: Dict[str, Any]) -> None:
+    """
+    Recursively merge src into dst, replacing everything but nested dicts.
+
+    Nested dicts are copied rather than shared, so later edits to dst never
+    reach src.
+    """
+    for key, value in src.items():
+        if isinstance(value, dict):
+            if not isinstance(dst.get(key), dict):
+                dst[key] = {}
+            _deep_merge(dst[key], value)
+        else:
+            dst[key] = value
+
+def _dirs_unchanged(dir_mtimes: Dict[str, int]) -> bool:
+    """Check that every directory still has its recorded mtime"""
+    try:
+        return all(os.stat(path).st_mtime_ns == mtime for path, mtime in dir_mtimes.items())
+    except OSError:
+        return False
+
+def _scan_prompts(root: str) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Walk a prompts tree with os.scandir.
+
+    Returns dotted prompt names (``dir.sub.name`` for ``dir/sub/name.md``)
+    and the mtime of every directory visited.
+    """
+    prompts: List[str] = []
+    dir_mtimes: Dict[str, int] = {}
+    prefix_len = len(os.path.join(root, ""))
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        # Stat before listing so a file added mid-scan invalidates the cache
+        dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    prompts.append(entry.path[prefix_len:-3].replace(os.sep, "."))
+    return prompts, dir_mtimes
+
 class ClaudeInterface(ABC):
     """Abstract base class for Claude SDK adapters"""
 
@@ -91,6 +184,14 @@ class ClaudeInterface(ABC):
 class UnifiedClaudeInterface:
     """Main unified interface that manages SDK adapters"""
 
+    # Process-wide resources, computed by the first instance that needs them.
+    # Set one back to None to have it recomputed on next use, e.g. after a
+    # change of working directory or HOME.
+    _cls_lock = threading.Lock()
+    _cls_logger: Optional[logging.Logger] = None
+    _cls_prompts_dir: Optional[str] = None
+    _cls_available_adapters: Optional[Tuple[SDKType, ...]] = None
+
     def __init__(self, config_file: Optional[str] = None):
         """
         Initialize the unified interface.
@@ -98,17 +199,27 @@ class UnifiedClaudeInterface:
         Args:
             config_file: Path to configuration file
         """
-        self.config_file = config_file or self._get_default_config_file()
+        self.config_file = config_file or self._default_config_file
         self.config = self._load_config()
-        self.logger = self._setup_logging()
-        self.adapters: Dict[SDKType, ClaudeInterface] = {}
+        self._save_lock = threading.Lock()
+        self._last_saved_bytes: Optional[bytes] = None
+        self.logger = self._get_shared("_cls_logger", self._setup_logging)
+        self._adapter_factories: Dict[SDKType, Callable[[], ClaudeInterface]] = {}
+        self._adapter_cache: Dict[SDKType, ClaudeInterface] = {}
         self.current_adapter: Optional[ClaudeInterface] = None
+        self._current_sdk_type: Optional[SDKType] = None
+
+        # Prompt listing as (root, {directory: mtime}, names) and prompt
+        # contents as {path: (mtime, content)}, revalidated with stat()
+        self._prompts_cache: Optional[Tuple[str, Dict[str, int], List[str]]] = None
+        self._prompt_content_cache: Dict[str, Tuple[int, str]] = {}
 
         # Initialize available adapters
         self._initialize_adapters()
 
-    def _get_default_config_file(self) -> str:
-        """Get default configuration file path"""
+    @cached_property
+    def _default_config_file(self) -> str:
+        """Default configuration file path"""
         return str(Path.home() / ".claude-universal" / "config.json")
 
     def _load_config(self) -> Dict[str, Any]:
@@ -132,78 +243,156 @@ class UnifiedClaudeInterface:
             }
         }
 
-        if os.path.exists(self.config_file):
+        try:
+            mtime = os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return default_config
+
+        # Reuse the parsed file while it is unchanged. Only the file's
+        # contents are cached; the defaults, including the environment's
+        # API key, are rebuilt on every load and merged on top.
+        cached = _CONFIG_CACHE.get(self.config_file)
+        if cached and cached[0] == mtime:
+            file_config = cached[1]
+        else:
             try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    # Merge with defaults
-                    return {**default_config, **config}
+                with open(self.config_file, 'rb') as f:
+                    file_config = _loads(f.read())
+                if not isinstance(file_config, dict):
+                    raise ValueError("expected a JSON object")
             except Exception as e:
-                logging.warning(f"Failed to load config file: {e}")
+                logging.warning("Failed to load config file: %s", e)
+                return default_config
+            _CONFIG_CACHE[self.config_file] = (mtime, file_config)
 
+        # Merge with defaults, keeping default keys of partially specified
+        # sections
+        _deep_merge(default_config, file_config)
         return default_config
 
     def _save_config(self) -> bool:
         """Save configuration to file"""
         try:
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            # Saves may run on worker threads; don't let two overlap, and
+            # serialize under the lock so an older snapshot can't be written
+            # after a newer one
+            with self._save_lock:
+                data = _dumps(self.config)
+                # Nothing to do if this is exactly what we last wrote
+                if data == self._last_saved_bytes:
+                    return True
+
+                # Write to a unique temp file and rename over the config so a
+                # crash never leaves a truncated file behind. mkstemp creates
+                # it owner-only; an existing config keeps its own mode.
+                config_dir = os.path.dirname(self.config_file)
+                os.makedirs(config_dir, exist_ok=True)
+                fd, tmp_file = tempfile.mkstemp(dir=config_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    if os.path.exists(self.config_file):
+                        shutil.copymode(self.config_file, tmp_file)
+                    os.replace(tmp_file, self.config_file)
+                except BaseException:
+                    os.unlink(tmp_file)
+                    raise
+                self._last_saved_bytes = data
             return True
         except Exception as e:
-            self.logger.error(f"Failed to save config: {e}")
+            self.logger.error("Failed to save config: %s", e)
             return False
 
+    @classmethod
+    def _get_shared(cls, name: str, compute: Callable[[], Any]) -> Any:
+        """Get a class-level resource, computing it once per process"""
+        value = getattr(cls, name)
+        if value is None:
+            with cls._cls_lock:
+                value = getattr(cls, name)
+                if value is None:
+                    value = compute()
+                    setattr(cls, name, value)
+        return value
+
     def _setup_logging(self) -> logging.Logger:
         """Set up logging"""
         logger = logging.getLogger("claude-unified")
+        if logger.handlers:
+            return logger
+
         logger.setLevel(logging.INFO)
+        handler = logging.StreamHandler()
+        handler.setFormatter(_LOG_FORMATTER)
+        logger.addHandler(handler)
+        return logger
 
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    def _initialize_adapters(self):
+        """Register available SDK adapters and set up the default one"""
+        # Register factories only; adapters are constructed on first use
+        available = self._get_shared("_cls_available_adapters", self._discover_adapters)
+
+        if SDKType.PYTHON_SDK in available:
+            self._adapter_factories[SDKType.PYTHON_SDK] = lambda: _load_python_adapter()(
+                api_key=self.config["apiToken"],
+                system_prompts_dir=self._get_system_prompts_dir()
             )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
 
-        return logger
+        if SDKType.CLAUDE_CODE_CLI in available:
+            self._adapter_factories[SDKType.CLAUDE_CODE_CLI] = lambda: _load_cli_adapter()(
+                system_prompts_dir=self._get_system_prompts_dir()
+            )
 
-    def _initialize_adapters(self):
-        """Initialize available SDK adapters"""
-        # Initialize Python adapter if available
-        if PythonAdapter:
-            try:
-                self.adapters[SDKType.PYTHON_SDK] = PythonAdapter(
-                    api_key=self.config["apiToken"],
-                    system_prompts_dir=self._get_system_prompts_dir()
-                )
-                self.logger.info("Python SDK adapter initialized")
-            except Exception as e:
-                self.logger.warning(f"Failed to initialize Python adapter: {e}")
+        # Set default adapter
+        default_sdk = _sdk_from_value(self.config["defaultSdk"])
+        self.current_adapter = self._get_adapter(default_sdk)
+        if self.current_adapter:
+            self._current_sdk_type = default_sdk
+        else:
+            for sdk_type in list(self._adapter_factories):
+                self.current_adapter = self._get_adapter(sdk_type)
+                if self.current_adapter:
+                    self._current_sdk_type = sdk_type
+                    self.logger.warning("Default SDK %s not available, using %s", default_sdk, self.current_adapter)
+                    break
+            else:
+                raise RuntimeError("No Claude SDK adapters available")
+
+    @staticmethod
+    def _discover_adapters() -> Tuple[SDKType, ...]:
+        """Find the SDK adapters whose modules can be imported"""
+        modules = {
+            SDKType.PYTHON_SDK: ".python_adapter",
+            SDKType.CLAUDE_CODE_CLI: ".cli_adapter",
+        }
+        return tuple(sdk for sdk, module in modules.items() if _adapter_available(module))
 
-        # Initialize CLI adapter if available
-        if CliAdapter:
+    def _get_adapter(self, sdk_type: SDKType) -> Optional[ClaudeInterface]:
+        """Get the adapter for an SDK, constructing it on first use"""
+        adapter = self._adapter_cache.get(sdk_type)
+        if adapter is None and sdk_type in self._adapter_factories:
             try:
-                self.adapters[SDKType.CLAUDE_CODE_CLI] = CliAdapter(
-                    system_prompts_dir=self._get_system_prompts_dir()
-                )
-                self.logger.info("Claude Code CLI adapter initialized")
+                adapter = self._adapter_factories[sdk_type]()
             except Exception as e:
-                self.logger.warning(f"Failed to initialize CLI adapter: {e}")
+                # Drop adapters that can't be constructed so they stop
+                # being reported as available
+                del self._adapter_factories[sdk_type]
+                self.logger.warning("Failed to initialize %s adapter: %s", sdk_type.value, e)
+                return None
 
-        # Set default adapter
-        default_sdk = SDKType(self.config["defaultSdk"])
-        if default_sdk in self.adapters:
-            self.current_adapter = self.adapters[default_sdk]
-        elif self.adapters:
-            self.current_adapter = list(self.adapters.values())[0]
-            self.logger.warning(f"Default SDK {default_sdk} not available, using {self.current_adapter}")
-        else:
-            raise RuntimeError("No Claude SDK adapters available")
+            self._adapter_cache[sdk_type] = adapter
+            self.logger.info("%s adapter initialized", sdk_type.value)
+        return adapter
 
     def _get_system_prompts_dir(self) -> str:
-        """Get system prompts directory"""
+        """Get system prompts directory, resolved once per process"""
+        return self._get_shared("_cls_prompts_dir", self._resolve_system_prompts_dir)
+
+    @staticmethod
+    def _resolve_system_prompts_dir() -> str:
+        """Find the system prompts directory"""
         # Look in common locations
         possible_dirs = [
             Path(__file__).parent.parent.parent / "sdk-system-prompts",
@@ -218,40 +407,55 @@ class UnifiedClaudeInterface:
         # Return default path even if it doesn't exist
         return str(Path.home() / ".claude-universal" / "system-prompts")
 
-    def switch_sdk(self, sdk_type: SDKType) -> bool:
+    def switch_sdk(self, sdk_type: SDKType, persist: bool = True) -> bool:
         """
         Switch to a different SDK.
 
         Args:
             sdk_type: The SDK type to switch to
+            persist: Make this SDK the configured default and save it to
+                the config file
 
         Returns:
             True if switch was successful
         """
-        if sdk_type not in self.adapters:
-            self.logger.error(f"SDK {sdk_type} not available")
+        adapter = self._get_adapter(sdk_type)
+        if not adapter:
+            self.logger.error("SDK %s not available", sdk_type)
             return False
 
-        self.current_adapter = self.adapters[sdk_type]
-        self.config["defaultSdk"] = sdk_type.value
-        self._save_config()
+        self.current_adapter = adapter
+        self._current_sdk_type = sdk_type
+        if persist:
+            self.config["defaultSdk"] = sdk_type.value
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+
+            if loop:
+                # Inside an event loop, save on the default executor so the
+                # caller isn't blocked on disk I/O. The job starts right away
+                # and asyncio.run() waits for the executor on shutdown, so the
+                # save isn't lost if the loop ends first.
+                loop.run_in_executor(None, self._save_config)
+            else:
+                self._save_config()
 
-        self.logger.info(f"Switched to {sdk_type.value}")
+        self.logger.info("Switched to %s", sdk_type.value)
         return True
 
     def get_available_sdks(self) -> List[SDKType]:
         """Get list of available SDKs"""
-        return list(self.adapters.keys())
+        return list(self._adapter_factories.keys())
+
+    def get_available_sdk_values(self) -> List[str]:
+        """Get the values of the available SDKs"""
+        return [sdk.value for sdk in self._adapter_factories]
 
     def get_current_sdk(self) -> Optional[SDKType]:
         """Get current SDK type"""
-        if not self.current_adapter:
-            return None
-
-        for sdk_type, adapter in self.adapters.items():
-            if adapter == self.current_adapter:
-                return sdk_type
-        return None
+        return self._current_sdk_type
 
     # Unified interface methods
     async def chat(self, message: str, system_prompt: Optional[str] = None) -> str:
@@ -279,44 +483,92 @@ class UnifiedClaudeInterface:
     async def create_project(self, template_name: str, project_name: str,
                            sdk_type: Optional[SDKType] = None) -> bool:
         """Create a new project using specified or current SDK"""
+        # Read the template on a worker thread while the adapter is resolved,
+        # which may construct it for the first time
+        template_future = self._start_template_load(template_name)
+        adapter = self._resolve_adapter(sdk_type)
+
+        template = await template_future
+        if not template:
+            raise ValueError(f"Template {template_name} not found")
+
+        return await adapter.create_project(template, project_name)
+
+    async def create_projects(self, projects: List[Tuple[str, str]],
+                              sdk_type: Optional[SDKType] = None) -> List[bool]:
+        """
+        Create several projects, loading all their templates concurrently.
+
+        Args:
+            projects: (template_name, project_name) pairs
+            sdk_type: SDK to use instead of the current one
+
+        Returns:
+            The create_project result for each pair, in order
+        """
+        template_futures = [self._start_template_load(template_name)
+                            for template_name, _ in projects]
+        adapter = self._resolve_adapter(sdk_type)
+        templates = await asyncio.gather(*template_futures)
+
+        results = []
+        for (template_name, project_name), template in zip(projects, templates):
+            if not template:
+                raise ValueError(f"Template {template_name} not found")
+            results.append(await adapter.create_project(template, project_name))
+        return results
+
+    def _resolve_adapter(self, sdk_type: Optional[SDKType]) -> ClaudeInterface:
+        """Get the adapter for sdk_type, or the current one if not given"""
         adapter = self.current_adapter
         if sdk_type:
-            if sdk_type not in self.adapters:
+            adapter = self._get_adapter(sdk_type)
+            if not adapter:
                 raise ValueError(f"SDK {sdk_type} not available")
-            adapter = self.adapters[sdk_type]
 
         if not adapter:
             raise RuntimeError("No SDK adapter available")
+        return adapter
 
-        # Load template
-        template = self._load_template(template_name)
-        if not template:
-            raise ValueError(f"Template {template_name} not found")
-
-        return await adapter.create_project(template, project_name)
+    def _start_template_load(self, template_name: str) -> asyncio.Future:
+        """Start loading a template on the default executor"""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(None, self._load_template, template_name)
 
     def _load_template(self, template_name: str) -> Optional[ProjectTemplate]:
         """Load a project template"""
         template_dir = Path(__file__).parent.parent / "templates"
         template_file = template_dir / f"{template_name}.json"
 
-        if not template_file.exists():
+        try:
+            mtime = template_file.stat().st_mtime_ns
+        except OSError:
             return None
 
+        # Templates are only read, so the cached instance can be shared
+        cache_key = str(template_file)
+        cached = _TEMPLATE_CACHE.get(cache_key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
         try:
-            with open(template_file, 'r') as f:
-                data = json.load(f)
-                return ProjectTemplate(**data)
+            with open(template_file, 'rb') as f:
+                data = _loads(f.read())
+                template = ProjectTemplate(**data)
         except Exception as e:
-            self.logger.error(f"Failed to load template {template_name}: {e}")
+            self.logger.error("Failed to load template %s: %s", template_name, e)
             return None
 
+        _TEMPLATE_CACHE[cache_key] = (mtime, template)
+        return template
+
     def get_configuration(self) -> Dict[str, Any]:
         """Get current configuration"""
-        config = self.config.copy()
-        config["currentSdk"] = self.get_current_sdk()
-        config["availableSdks"] = [sdk.value for sdk in self.get_available_sdks()]
-        return config
+        return {
+            **self.config,
+            "currentSdk": self.get_current_sdk(),
+            "availableSdks": self.get_available_sdk_values()
+        }
 
     def set_configuration(self, **kwargs) -> bool:
         """Set configuration values"""
@@ -324,15 +576,15 @@ class UnifiedClaudeInterface:
             if key in self.config:
                 self.config[key] = value
             else:
-                self.logger.warning(f"Unknown configuration key: {key}")
+                self.logger.warning("Unknown configuration key: %s", key)
 
         return self._save_config()
 
     async def execute_command(self, command: str, sdk_type: Optional[SDKType] = None) -> str:
         """Execute a command using specified or current SDK"""
         adapter = self.current_adapter
-        if sdk_type and sdk_type in self.adapters:
-            adapter = self.adapters[sdk_type]
+        if sdk_type and sdk_type in self._adapter_factories:
+            adapter = self._get_adapter(sdk_type) or adapter
 
         if not adapter:
             raise RuntimeError("No SDK adapter available")
@@ -346,67 +598,111 @@ class UnifiedClaudeInterface:
     def list_system_prompts(self) -> List[str]:
         """List available system prompts"""
         prompts_dir = Path(self._get_system_prompts_dir())
+
+        # Adding or removing a file bumps its directory's mtime, so the
+        # listing is still valid while no directory in the tree has changed
+        cached = self._prompts_cache
+        if cached and cached[0] == str(prompts_dir) and _dirs_unchanged(cached[1]):
+            return list(cached[2])
+
         if not prompts_dir.exists():
             return []
 
-        prompts = []
-        for prompt_file in prompts_dir.rglob("*.md"):
-            relative_path = prompt_file.relative_to(prompts_dir)
-            prompts.append(str(relative_path).replace('/', '.'))
-
-        return sorted(prompts)
+        prompts, dir_mtimes = _scan_prompts(str(prompts_dir))
+        prompts.sort()
+        self._prompts_cache = (str(prompts_dir), dir_mtimes, prompts)
+        return list(prompts)
 
     def get_system_prompt(self, prompt_name: str) -> Optional[str]:
         """Get a system prompt by name"""
         prompts_dir = Path(self._get_system_prompts_dir())
         prompt_file = prompts_dir / f"{prompt_name.replace('.', '/')}.md"
 
-        if not prompt_file.exists():
+        try:
+            mtime = prompt_file.stat().st_mtime_ns
+        except OSError:
             return None
 
+        cache_key = str(prompt_file)
+        cached = self._prompt_content_cache.get(cache_key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
         try:
             with open(prompt_file, 'r', encoding='utf-8') as f:
-                return f.read()
+                content = f.read()
+            self._prompt_content_cache[cache_key] = (mtime, content)
+            return content
         except Exception as e:
-            self.logger.error(f"Failed to read prompt {prompt_name}: {e}")
+            self.logger.error("Failed to read prompt %s: %s", prompt_name, e)
             return None
 
 # Convenience functions for easy usage
+_DEFAULT_INTERFACE: Optional[UnifiedClaudeInterface] = None
+_DEFAULT_INTERFACE_LOCK = threading.Lock()
+
+def _get_default_interface() -> UnifiedClaudeInterface:
+    """Get the shared interface used by the convenience functions"""
+    global _DEFAULT_INTERFACE
+    if _DEFAULT_INTERFACE is None:
+        with _DEFAULT_INTERFACE_LOCK:
+            if _DEFAULT_INTERFACE is None:
+                _DEFAULT_INTERFACE = UnifiedClaudeInterface()
+    return _DEFAULT_INTERFACE
+
+def _get_call_adapter(sdk: Optional[str] = None) -> ClaudeInterface:
+    """
+    Get the adapter for one convenience call.
+
+    Uses the requested SDK when it is available, otherwise the configured
+    default, so a call with sdk= never changes what later calls use.
+    """
+    interface = _get_default_interface()
+    if sdk:
+        adapter = interface._get_adapter(_sdk_from_value(sdk))
+        if adapter:
+            return adapter
+        interface.logger.error("SDK %s not available", sdk)
+
+    default_sdk = _sdk_from_value(interface.config["defaultSdk"])
+    for sdk_type in (default_sdk, *list(interface._adapter_factories)):
+        adapter = interface._get_adapter(sdk_type)
+        if adapter:
+            return adapter
+    raise RuntimeError("No SDK adapter available")
+
 async def chat(message: str, sdk: Optional[str] = None, system_prompt: Optional[str] = None) -> str:
     """Quick chat function"""
-    interface = UnifiedClaudeInterface()
-    if sdk:
-        interface.switch_sdk(SDKType(sdk))
-    return await interface.chat(message, system_prompt)
+    return await _get_call_adapter(sdk).chat(message, system_prompt)
 
 async def analyze_file(file_path: str, sdk: Optional[str] = None) -> AnalysisResult:
     """Quick file analysis function"""
-    interface = UnifiedClaudeInterface()
-    if sdk:
-        interface.switch_sdk(SDKType(sdk))
-    return await interface.analyze_file(file_path)
+    return await _get_call_adapter(sdk).analyze_file(file_path)
 
 # CLI interface
-def main():
-    """Command-line interface for the unified Claude interface"""
+@lru_cache(maxsize=None)
+def _build_parser() -> "argparse.ArgumentParser":
+    """Build the CLI argument parser once per process"""
     import argparse
-    import asyncio
 
     parser = argparse.ArgumentParser(description="Unified Claude Interface")
     parser.add_argument("command", choices=["chat", "analyze", "create", "status", "config"])
-    parser.add_argument("--sdk", choices=[sdk.value for sdk in SDKType])
+    parser.add_argument("--sdk", choices=list(_SDK_BY_VALUE))
     parser.add_argument("--message", help="Message for chat command")
     parser.add_argument("--file", help="File path for analyze command")
     parser.add_argument("--template", help="Template name for create command")
     parser.add_argument("--project", help="Project name for create command")
+    return parser
 
-    args = parser.parse_args()
+def main():
+    """Command-line interface for the unified Claude interface"""
+    args = _build_parser().parse_args()
 
     async def run_command():
         interface = UnifiedClaudeInterface()
 
         if args.sdk:
-            interface.switch_sdk(SDKType(args.sdk))
+            interface.switch_sdk(_SDK_BY_VALUE[args.sdk])
 
         if args.command == "chat":
             if not args.message:
@@ -426,23 +722,24 @@ def main():
             print(f"Analysis for {result.file_path}:")
             print(result.analysis)
             if result.suggestions:
-                print("\nSuggestions:")
-                for suggestion in result.suggestions:
-                    print(f"  - {suggestion}")
+                # Emit the whole list in one write
+                sys.stdout.write("\nSuggestions:\n" +
+                                 "\n".join(f"  - {s}" for s in result.suggestions) + "\n")
 
         elif args.command == "status":
-            config = interface.get_configuration()
+            # Read the fields directly rather than building the full config copy
             print("Claude Unified Interface Status:")
-            print(f"  Current SDK: {config['currentSdk']}")
-            print(f"  Available SDKs: {', '.join(config['availableSdks'])}")
-            print(f"  Model: {config['model']}")
-            print(f"  Streaming: {config['features']['streaming']}")
+            print(f"  Current SDK: {interface.get_current_sdk()}")
+            print(f"  Available SDKs: {', '.join(interface.get_available_sdk_values())}")
+            print(f"  Model: {interface.config['model']}")
+            print(f"  Streaming: {interface.config['features']['streaming']}")
 
         elif args.command == "config":
             print("Current configuration:")
-            print(json.dumps(interface.get_configuration(), indent=2))
+            print(_dumps(interface.get_configuration()).decode('utf-8'))
 
     asyncio.run(run_command())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file